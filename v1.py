@@ -1,6 +1,20 @@
+import asyncio
 import boto3
-import json
+import gzip
+import hashlib
+import html
+import logging
+import logging.handlers
+import orjson
+import os
+import queue
+import random
+import sys
+from botocore.exceptions import ClientError
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, UTC
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Dict, Optional
 
 # AWS Credentials for testing
@@ -8,6 +22,19 @@ aws_access_key = ""
 aws_secret_key = ""
 aws_region = "us-east-1"
 
+logger = logging.getLogger(__name__)
+
+# Report outputs
+write_html_report = True
+report_css_filename = "aws_anomalies_detailed.css"
+# Write the HTML report as .html.gz for serving with Content-Encoding: gzip;
+# browsers do not decompress .gz files opened straight from disk
+gzip_html_report = False
+
+# Cost Explorer request limits
+max_concurrent_requests = 5
+max_retries = 5
+
 def get_cost_explorer_client():
     return boto3.client(
         'ce',
@@ -16,123 +43,190 @@ def get_cost_explorer_client():
         region_name=aws_region
     )
 
+async def call_cost_explorer(semaphore, method, **kwargs):
+    async with semaphore:
+        for attempt in range(max_retries + 1):
+            try:
+                return await asyncio.to_thread(method, **kwargs)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'ThrottlingException' or attempt == max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())
+
+@dataclass(slots=True)
 class CostUsageDataPoint:
-    def __init__(self, date: str, amount: str, unit: str):
-        self.Date = date
-        self.Amount = amount
-        self.Unit = unit
+    Date: str
+    Amount: float
+    Unit: str
 
+@dataclass(slots=True)
 class RootCauseEntry:
-    def __init__(self, service, region, usage_type, linked_account, linked_account_name, cost_impact):
-        self.Service = service
-        self.Region = region
-        self.UsageType = usage_type
-        self.LinkedAccount = linked_account
-        self.LinkedAccountName = linked_account_name
-        self.Tags = {"Environment": "Production", "Owner": "FinanceTeam"}
-        self.CostImpact = f"{float(cost_impact):.2f}" if cost_impact else "0.00"
-        self.CostUsageGraph: List[CostUsageDataPoint] = []
-
+    Service: Optional[str]
+    Region: Optional[str]
+    UsageType: Optional[str]
+    LinkedAccount: Optional[str]
+    LinkedAccountName: Optional[str]
+    CostImpact: float
+    Tags: Dict[str, str] = field(default_factory=lambda: {"Environment": "Production", "Owner": "FinanceTeam"})
+    CostUsageGraph: List[CostUsageDataPoint] = field(default_factory=list)
+
+@dataclass(slots=True)
 class AnomalyEntry:
-    def __init__(self, anomaly_id, start_date, end_date, impact, duration, root_causes):
-        self.AnomalyId = anomaly_id
-        self.StartDate = start_date
-        self.EndDate = end_date
-        self.LastDetectedDate = end_date
-        self.DurationInDays = duration
-        self.TotalCostImpact = f"{impact:.2f}"
-        self.AverageDailyCost = f"{(impact / duration):.2f}" if duration > 0 else f"{impact:.2f}"
-        self.Currency = "USD"
-        self.RootCauses = root_causes
+    AnomalyId: str
+    StartDate: str
+    EndDate: str
+    LastDetectedDate: str
+    DurationInDays: int
+    TotalCostImpact: str
+    AverageDailyCost: str
+    Currency: str = "USD"
+    RootCauses: List[RootCauseEntry] = field(default_factory=list)
 
 async def fetch_anomalies():
+    return materialize_entries(await fetch_anomalies_raw())
+
+async def fetch_anomalies_raw():
+    # Entries are plain dicts in the JSON export shape, so they can be
+    # serialized directly without building the entity objects
     client = get_cost_explorer_client()
+    # The request limit and shared cost usage requests live for one run, bound to its event loop
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    cost_usage_cache: Dict[tuple, asyncio.Future] = {}
     output = []
-    start = (datetime.now(UTC) - timedelta(days=90)).strftime('%Y-%m-%d')
-    end = datetime.now(UTC).strftime('%Y-%m-%d')
-
-    next_token = None
-
-    while True:
-        request = {
-            'DateInterval': {'StartDate': start, 'EndDate': end}
-        }
-        if next_token:
-            request['NextPageToken'] = next_token
-
-        response = client.get_anomalies(**request)
-
-        for anomaly in response.get('Anomalies', []):
-            anomaly_start = datetime.strptime(anomaly['AnomalyStartDate'].split('T')[0], '%Y-%m-%d')
-            anomaly_end = datetime.strptime(anomaly['AnomalyEndDate'].split('T')[0], '%Y-%m-%d')
-            duration = (anomaly_end - anomaly_start).days + 1 or 1
-
-            impact = float(anomaly.get('Impact', {}).get('TotalImpact', 0))
-            root_causes = []
-
-            for rc in anomaly.get('RootCauses', []):
-                root_cause = RootCauseEntry(
-                    service=rc.get('Service'),
-                    region=rc.get('Region'),
-                    usage_type=rc.get('UsageType'),
-                    linked_account=rc.get('LinkedAccount'),
-                    linked_account_name=rc.get('LinkedAccountName'),
-                    cost_impact=rc.get('Impact', {}).get('Contribution', 0)
-                )
-
-                root_cause.CostUsageGraph = await fetch_cost_usage_for_root_cause(
-                    client, anomaly_start, anomaly_end, root_cause
-                )
-
-                root_causes.append(root_cause)
-
-            entry = AnomalyEntry(
-                anomaly_id=anomaly.get('AnomalyId'),
-                start_date=anomaly.get('AnomalyStartDate'),
-                end_date=anomaly.get('AnomalyEndDate'),
-                impact=impact,
-                duration=duration,
-                root_causes=root_causes
-            )
-
-            output.append(entry)
-
-        next_token = response.get('NextPageToken')
-        if not next_token:
-            break
+    now = datetime.now(UTC)
+    start = (now - timedelta(days=90)).strftime('%Y-%m-%d')
+    end = now.strftime('%Y-%m-%d')
 
-    return output
+    paginator = client.get_paginator('get_anomalies')
+    pages = iter(paginator.paginate(DateInterval={'StartDate': start, 'EndDate': end}))
 
-async def fetch_cost_usage_for_root_cause(client, start_date, end_date, root_cause):
-    filter_list = []
+    next_page = asyncio.ensure_future(fetch_next_page(semaphore, pages))
+    while (page := await next_page) is not None:
+        # Prefetch the following page while this one is being processed
+        next_page = asyncio.ensure_future(fetch_next_page(semaphore, pages))
 
-    def add_filter(key, value):
-        if value:
-            filter_list.append({
-                'Dimensions': {
-                    'Key': key,
-                    'Values': [value]
-                }
+        entries = await asyncio.gather(*[
+            build_anomaly_entry(client, semaphore, cost_usage_cache, anomaly)
+            for anomaly in page.get('Anomalies', [])
+        ])
+        output.extend(entries)
+
+    return output
+
+async def fetch_next_page(semaphore, pages):
+    async with semaphore:
+        return await asyncio.to_thread(next, pages, None)
+
+async def build_anomaly_entry(client, semaphore, cost_usage_cache, anomaly):
+    anomaly_start = datetime.fromisoformat(anomaly['AnomalyStartDate'][:10])
+    anomaly_end = datetime.fromisoformat(anomaly['AnomalyEndDate'][:10])
+    duration = (anomaly_end - anomaly_start).days + 1 or 1
+
+    impact = float(anomaly.get('Impact', {}).get('TotalImpact', 0))
+    root_causes = []
+    for rc in anomaly.get('RootCauses', []):
+        contribution = float(rc.get('Impact', {}).get('Contribution') or 0)
+        root_causes.append({
+            'Service': rc.get('Service'),
+            'Region': rc.get('Region'),
+            'UsageType': rc.get('UsageType'),
+            'LinkedAccount': rc.get('LinkedAccount'),
+            'LinkedAccountName': rc.get('LinkedAccountName'),
+            # The export keeps cost impact as a 2-decimal string, like the anomaly totals
+            'CostImpact': f"{contribution:.2f}",
+            'Tags': {"Environment": "Production", "Owner": "FinanceTeam"}
+        })
+
+    # Cost Explorer time periods are end-exclusive
+    period_start = anomaly['AnomalyStartDate'][:10]
+    period_end = (anomaly_end + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    # Fetch the cost usage graphs for all root causes concurrently
+    graphs = await asyncio.gather(*[
+        fetch_cost_usage_for_root_cause(client, semaphore, cost_usage_cache, period_start, period_end, root_cause)
+        for root_cause in root_causes
+    ])
+    for root_cause, graph in zip(root_causes, graphs):
+        root_cause['CostUsageGraph'] = graph
+
+    return {
+        'AnomalyId': anomaly.get('AnomalyId'),
+        'StartDate': anomaly.get('AnomalyStartDate'),
+        'EndDate': anomaly.get('AnomalyEndDate'),
+        'LastDetectedDate': anomaly.get('AnomalyEndDate'),
+        'DurationInDays': duration,
+        'TotalCostImpact': f"{impact:.2f}",
+        'AverageDailyCost': f"{(impact / duration):.2f}" if duration > 0 else f"{impact:.2f}",
+        'Currency': "USD",
+        'RootCauses': root_causes
+    }
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def materialize_entries(raw_entries):
+    # Dimension values and dates repeat across root causes, so each distinct string is kept once
+    return [
+        AnomalyEntry(**{**raw, 'RootCauses': [
+            RootCauseEntry(**{
+                **rc,
+                'CostImpact': float(rc['CostImpact']),
+                'Service': intern_text(rc['Service']),
+                'Region': intern_text(rc['Region']),
+                'UsageType': intern_text(rc['UsageType']),
+                'LinkedAccount': intern_text(rc['LinkedAccount']),
+                'LinkedAccountName': intern_text(rc['LinkedAccountName']),
+                'CostUsageGraph': [
+                    CostUsageDataPoint(intern_text(point['Date']), float(point['Amount']), intern_text(point['Unit']))
+                    for point in rc['CostUsageGraph']
+                ]
             })
+            for rc in raw['RootCauses']
+        ]})
+        for raw in raw_entries
+    ]
+
+async def fetch_cost_usage_for_root_cause(client, semaphore, cost_usage_cache, period_start, period_end, root_cause):
+    # Root causes sharing the same filters and date range reuse one request
+    key = (
+        root_cause['Service'],
+        root_cause['Region'],
+        root_cause['UsageType'],
+        root_cause['LinkedAccount'],
+        period_start,
+        period_end
+    )
+    if key not in cost_usage_cache:
+        cost_usage_cache[key] = asyncio.ensure_future(
+            load_cost_usage_for_root_cause(client, semaphore, period_start, period_end, root_cause)
+        )
+    # Shielded so one cancelled waiter does not cancel the request for the others
+    return await asyncio.shield(cost_usage_cache[key])
+
+async def load_cost_usage_for_root_cause(client, semaphore, period_start, period_end, root_cause):
+    filter_list = [
+        {'Dimensions': {'Key': key, 'Values': [value]}}
+        for key, value in (
+            ('SERVICE', root_cause['Service']),
+            ('REGION', root_cause['Region']),
+            ('USAGE_TYPE', root_cause['UsageType']),
+            ('LINKED_ACCOUNT', root_cause['LinkedAccount'])
+        )
+        if value
+    ]
 
-    add_filter('SERVICE', root_cause.Service)
-    add_filter('REGION', root_cause.Region)
-    add_filter('USAGE_TYPE', root_cause.UsageType)
-    add_filter('LINKED_ACCOUNT', root_cause.LinkedAccount)
+    # Without any dimension the query would return account-wide costs
+    if not filter_list:
+        logger.warning("Skipping cost usage fetch for root cause without dimensions for %s to %s", period_start, period_end)
+        return []
 
-    if len(filter_list) == 1:
-        filters = filter_list[0]
-    elif len(filter_list) > 1:
-        filters = {'And': filter_list}
-    else:
-        filters = None
+    filters = filter_list[0] if len(filter_list) == 1 else {'And': filter_list}
 
     try:
-        response = client.get_cost_and_usage(
-            TimePeriod={
-                'Start': start_date.strftime('%Y-%m-%d'),
-                'End': (end_date + timedelta(days=1)).strftime('%Y-%m-%d')
-            },
+        response = await call_cost_explorer(
+            semaphore,
+            client.get_cost_and_usage,
+            TimePeriod={'Start': period_start, 'End': period_end},
             Granularity='DAILY',
             Metrics=['UnblendedCost'],
             Filter=filters
@@ -141,38 +235,39 @@ async def fetch_cost_usage_for_root_cause(client, start_date, end_date, root_cau
         points = []
         for time_period in response['ResultsByTime']:
             amount_data = time_period['Total'].get('UnblendedCost', {})
-            points.append(CostUsageDataPoint(
-                date=time_period['TimePeriod']['Start'],
-                amount=amount_data.get('Amount', "0"),
-                unit=amount_data.get('Unit', "USD")
-            ))
+            points.append({
+                'Date': time_period['TimePeriod']['Start'],
+                # Exported as returned by Cost Explorer; parsed when materializing entries
+                'Amount': amount_data.get('Amount', "0"),
+                'Unit': amount_data.get('Unit', "USD")
+            })
         return points
 
-    except Exception as e:
-        print(f"Error fetching cost usage for root cause {root_cause.Service}: {e}")
+    except Exception:
+        logger.exception("Error fetching cost usage for root cause %s", root_cause['Service'])
         return []
 
 def save_to_json(entries, filename):
-    def default_serializer(o):
-        if isinstance(o, (AnomalyEntry, RootCauseEntry, CostUsageDataPoint)):
-            return o.__dict__
-        return str(o)
-
-    with open(filename, 'w') as f:
-        json.dump(entries, f, indent=4, default=default_serializer)
-
-    print(f"Saved {len(entries)} entries to {filename}")
-
-def generate_accordion_html(entry, idx, start_readable, end_readable):
-    return f"""
-    <div class="accordion-item">
+    # orjson serializes both the raw dicts and the dataclass entries natively
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(entries, option=orjson.OPT_INDENT_2))
+
+ACCORDION_TEMPLATE = """
+    <template class="anomaly-template">
+    <div class="accordion-item"
+         data-anomaly-id="{anomaly_id}"
+         data-date-range="{start_readable} to {end_readable}"
+         data-total-cost="${total_cost_impact}"
+         data-avg-daily="${average_daily_cost}"
+         data-duration="{duration} days"
+         data-currency="{currency}">
         <button type="button" 
                 class="accordion-header" 
                 data-target="anomaly{idx}"
                 aria-expanded="false">
             <div class="header-section">
                 <span class="header-label">Anomaly ID</span>
-                <span class="header-value">{entry.AnomalyId}</span>
+                <span class="header-value">{anomaly_id}</span>
             </div>
             <div class="header-section">
                 <span class="header-label">Date Range</span>
@@ -180,7 +275,7 @@ def generate_accordion_html(entry, idx, start_readable, end_readable):
             </div>
             <div class="header-section cost-impact">
                 <span class="header-label">Total Cost Impact</span>
-                <span class="header-value">${entry.TotalCostImpact}</span>
+                <span class="header-value">${total_cost_impact}</span>
                 <span class="share-icon" title="Share via Email">📧</span>
             </div>
         </button>
@@ -192,43 +287,33 @@ def generate_accordion_html(entry, idx, start_readable, end_readable):
                     <th>Average Daily Cost</th>
                     <th>Currency</th>
                 </tr>
-                <tr>
-                    <td>{entry.DurationInDays} days</td>
-                    <td>${entry.TotalCostImpact}</td>
-                    <td>${entry.AverageDailyCost}</td>
-                    <td>{entry.Currency}</td>
+                <tr class="info-row">
+                    <td class="info-cell">{duration} days</td>
+                    <td class="info-cell">${total_cost_impact}</td>
+                    <td class="info-cell">${average_daily_cost}</td>
+                    <td class="info-cell">{currency}</td>
                 </tr>
             </table>
             <h3 class="root-causes-title">Root Causes:</h3>
     """
 
-def generate_root_cause_html(rc, idx, rc_idx, chart_id):
-    # Format cost impact with proper decimal places
-    try:
-        cost_impact = float(rc.CostImpact)
-        formatted_cost_impact = f"${cost_impact:.2f}"
-    except (ValueError, TypeError):
-        formatted_cost_impact = "$0.00"
-    
-    # Format tags for display
-    tags_html = ""
-    for key, value in rc.Tags.items():
-        tags_html += f"""
+TAG_TEMPLATE = """
             <div class="tag">
                 <span class="tag-key">{key}:</span>
                 <span>{value}</span>
             </div>
         """
-    
-    return f"""
-        <div class="root-cause">
+
+ROOT_CAUSE_TEMPLATE = """
+        <div class="rc-card">
             <div class="root-cause-header" 
                  id="root-cause-header-{idx}-{rc_idx}" 
-                 onclick="toggleRootCause({idx}, {rc_idx}, event)">
+                 data-anomaly-index="{idx}"
+                 data-root-cause-index="{rc_idx}">
                 <span class="root-cause-toggle-icon">▼</span>
                 <div class="root-cause-info">
-                    <span class="root-cause-title">{rc.Service}</span>
-                    <span class="root-cause-subtitle">{rc.Region} - {rc.UsageType}</span>
+                    <span class="root-cause-title">{service}</span>
+                    <span class="root-cause-subtitle">{region} - {usage_type}</span>
                 </div>
             </div>
             <div class="root-cause-content" id="root-cause-content-{idx}-{rc_idx}">
@@ -241,13 +326,13 @@ def generate_root_cause_html(rc, idx, rc_idx, chart_id):
                         <th>Cost Impact</th>
                         <th>Tags</th>
                     </tr>
-                    <tr>
-                        <td>{rc.Service}</td>
-                        <td>{rc.Region}</td>
-                        <td>{rc.UsageType}</td>
-                        <td>{rc.LinkedAccount} ({rc.LinkedAccountName})</td>
-                        <td class="cost-impact">{formatted_cost_impact}</td>
-                        <td class="tags-cell">{tags_html}</td>
+                    <tr class="rc-row">
+                        <td class="rc-cell">{service}</td>
+                        <td class="rc-cell">{region}</td>
+                        <td class="rc-cell">{usage_type}</td>
+                        <td class="rc-cell">{linked_account} ({linked_account_name})</td>
+                        <td class="rc-cell cost-impact">{cost_impact}</td>
+                        <td class="rc-cell tags-cell">{tags}</td>
                     </tr>
                 </table>
                 <h4>Cost Usage Graph:</h4>
@@ -260,36 +345,32 @@ def generate_root_cause_html(rc, idx, rc_idx, chart_id):
                     </tr>
     """
 
-def generate_cost_usage_rows(rc):
-    rows = ""
-    for point in rc.CostUsageGraph:
-        rows += f"""
-                        <tr>
-                            <td>{point.Date}</td>
-                            <td>${float(point.Amount):.2f}</td>
-                            <td>{point.Unit}</td>
-                        </tr>
-        """
-    return rows
+# Rendered once per data point, so kept on one line without indentation padding
+COST_USAGE_ROW_TEMPLATE = '<tr class="rc-row"><td class="rc-cell">{date}</td><td class="rc-cell">${amount:.2f}</td><td class="rc-cell">{unit}</td></tr>\n'
 
-def generate_html_report(entries: List[AnomalyEntry], filename: str):
-    # Collect unique services from anomalies
-    unique_services = set()
-    for entry in entries:
-        for rc in entry.RootCauses:
-            if rc.Service:
-                unique_services.add(rc.Service)
-    services_list = sorted(list(unique_services))
+ROOT_CAUSE_FOOTER = """
+                        </table>
+                    </div>
+                </div>
+            """
 
-    # Collect unique linked accounts from anomalies
-    unique_linked_accounts = set()
-    for entry in entries:
-        for rc in entry.RootCauses:
-            if rc.LinkedAccount:
-                unique_linked_accounts.add(f"{rc.LinkedAccount} ({rc.LinkedAccountName})")
-    linked_accounts_list = sorted(list(unique_linked_accounts))
+ANOMALY_INDEX_TEMPLATE = """
+        <script type="application/json" id="anomalies">{payload}</script>
+    """
+
+CHART_DATA_TEMPLATE = """
+        <script type="application/json" id="chart-data">{payload}</script>
+    """
+
+ACCORDION_FOOTER = """
+                </div>
+            </div>
+    </template>
+        """
+
+OPTION_TEMPLATE = '<option value="{value}">{value}</option>\n'
 
-    html = """
+REPORT_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -300,138 +381,544 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
         <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf-autotable/3.5.31/jspdf.plugin.autotable.min.js"></script>
         <script src="https://cdn.sheetjs.com/xlsx-0.20.1/package/dist/xlsx.full.min.js"></script>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/flatpickr/dist/flatpickr.min.css">
-        <script src="https://cdn.jsdelivr.net/npm/flatpickr"></script>
+        <script src="https://cdn.jsdelivr.net/npm/flatpickr" defer></script>
+    """
+
+REPORT_STYLESHEET_LINK = """
+        <link rel="stylesheet" href="{href}">
+    """
+
+REPORT_HEADER = """
         <style>
+            /* Critical styles; the rest load from the report stylesheet */
             body { font-family: Arial, sans-serif; padding: 20px; background: #f7f9fa; }
             h1 { margin-bottom: 30px; text-align: center; color: #2c3e50; }
-            .controls { 
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-                padding: 25px;
-                background: white;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                max-width: 90%;  /* Match accordion width */
-                margin-left: auto;
-                margin-right: auto;
-            }
-            .filter-group {
-                display: flex;
-                flex-direction: column;
-                gap: 8px;
-                min-width: 0;  /* Allow shrinking */
-            }
-            .filter-group label {
-                font-size: 0.9em;
-                color: #666;
-                font-weight: bold;
-                margin-bottom: 2px;
-            }
-            .filter-input {
-                padding: 8px 12px;
-                font-size: 0.9em;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                width: 100%;
-                box-sizing: border-box;
-                height: 38px;  /* Match height with buttons */
-            }
-            .filter-input:focus {
-                border-color: #4682b4;
-                outline: none;
-                box-shadow: 0 0 0 2px rgba(70,130,180,0.2);
-            }
-            .export-group {
-                display: flex;
-                gap: 12px;
-                grid-column: 1 / -1;
-                justify-content: flex-end;
-                margin-top: 10px;
-                padding-top: 15px;
-                border-top: 1px solid #e6f0f7;
-                align-items: center;  /* Align buttons vertically */
-            }
-            .export-btn {
-                padding: 8px 12px;  /* Increased padding */
-                font-size: 0.9em;
-                border-radius: 4px;
-                border: none;
-                background: #4682b4;
-                color: white;
-                cursor: pointer;
-                display: inline-flex;
-                align-items: center;
-                gap: 6px;
-                transition: all 0.2s;
-                min-width: 160px;
-                justify-content: center;
-                height: 38px;  /* Increased height to match dropdown */
-                line-height: 1.2;  /* Added line height for better text alignment */
-            }
-            .export-btn:hover {
-                background: #3a6a9a;
-                transform: translateY(-1px);
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            .export-btn:active {
-                background: #2c5282;
-                transform: translateY(0);
-            }
-            .export-btn span {
-                font-size: 1.1em;
-            }
-            .email-btn {
-                padding: 4px 8px;
-                font-size: 0.85em;
-                border-radius: 4px;
-                border: 1px solid #4682b4;
-                background: white;
-                color: #4682b4;
-                cursor: pointer;
-                display: inline-flex;
-                align-items: center;
-                gap: 4px;
-                transition: all 0.2s;
-                margin-left: 10px;
-            }
-            .email-btn:hover {
-                background: #f0f7fc;
-                border-color: #3a6a9a;
-                color: #3a6a9a;
-            }
-            .email-btn:active {
-                background: #e6f0f7;
-            }
-            .email-btn span {
-                font-size: 1.1em;
-            }
-            #filterSummary {
-                grid-column: 1 / -1;  /* Span all columns */
-                text-align: right;
-                color: #666;
-                font-size: 0.9em;
-                margin-top: 10px;
-                padding-top: 10px;
-                border-top: 1px solid #e6f0f7;
-            }
-            @media (min-width: 1200px) {
-                .controls {
-                    grid-template-columns: repeat(5, 1fr);  /* 5 columns for larger screens */
+            .accordion-header { background: #4682b4; color: #fff; cursor: pointer; padding: 15px 20px; border: none; width: 100%; text-align: left; }
+            .accordion-content, .root-cause-content, .root-causes-content, .root-causes-list { display: none; }
+            .accordion-content.show, .root-cause-content.show, .root-causes-content.show, .root-causes-list.show { display: block; }
+            table { border-collapse: collapse; width: 100%; margin-bottom: 20px; background: white; }
+            th, td { border: 1px solid #ddd; padding: 12px 8px; text-align: left; }
+        </style>
+        <script>
+            // One formatter shared by every chart's tooltip and axis labels
+            window._usd = new Intl.NumberFormat('en-US', { style: 'currency', currency: 'USD' });
+
+            // Define charts object first and attach to window immediately
+            window.charts = {
+                initialize: function(chartId, labels, data) {
+                    try {
+                        if (!chartId || !Array.isArray(labels) || !Array.isArray(data)) {
+                            console.warn('Invalid parameters for chart initialization');
+                            return;
+                        }
+                        const ctx = document.getElementById(chartId);
+                        if (!ctx) {
+                            console.warn(`Chart canvas not found: ${chartId}`);
+                            return;
+                        }
+                        if (window.chartInstances && window.chartInstances[chartId]) {
+                            window.chartInstances[chartId].destroy();
+                        }
+                        const chart = new Chart(ctx.getContext('2d'), {
+                            type: 'line',
+                            data: {
+                                labels: labels,
+                                datasets: [{
+                                    label: 'Cost',
+                                    data: data,
+                                    borderColor: '#4682b4',
+                                    backgroundColor: 'rgba(70,130,180,0.1)',
+                                    fill: true,
+                                    tension: 0.2
+                                }]
+                            },
+                            options: {
+                                responsive: true,
+                                maintainAspectRatio: false,
+                                animation: false,
+                                plugins: {
+                                    legend: { display: false },
+                                    tooltip: {
+                                        callbacks: {
+                                            label: ctx => window._usd.format(ctx.raw)
+                                        }
+                                    }
+                                },
+                                scales: {
+                                    x: { 
+                                        title: { display: true, text: 'Date', font: { weight: 'bold' } }
+                                    },
+                                    y: { 
+                                        title: { display: true, text: 'Amount (USD)', font: { weight: 'bold' } },
+                                        ticks: {
+                                            callback: v => window._usd.format(v)
+                                        }
+                                    }
+                                }
+                            }
+                        });
+                        if (!window.chartInstances) window.chartInstances = {};
+                        window.chartInstances[chartId] = chart;
+                    } catch (error) {
+                        console.error(`Error initializing chart ${chartId}:`, error);
+                    }
+                },
+                // Charts are built on first reveal from the report's chart data payload
+                initializeWithin: function(root) {
+                    if (!window.chartData) {
+                        window.chartData = JSON.parse(document.getElementById('chart-data')?.textContent || '{}');
+                    }
+                    root.querySelectorAll('.chart-container canvas:not([data-chart-init])').forEach(canvas => {
+                        const chart = window.chartData[canvas.id];
+                        if (!chart) return;
+                        window.charts.initialize(canvas.id, chart.labels, chart.data);
+                        canvas.dataset.chartInit = '1';
+                    });
                 }
-                .export-group {
-                    grid-column: auto;  /* Don't span all columns on large screens */
-                    border-top: none;
-                    margin-top: 0;
-                    padding-top: 0;
+            };
+
+            // Promote an element only for the duration of its transition
+            window.hintWillChange = function(el, property) {
+                el.style.willChange = property;
+                const clear = () => { el.style.willChange = 'auto'; };
+                el.addEventListener('transitionend', clear, { once: true });
+            };
+
+            // Define and attach all other functions to window immediately
+            window.toggleAccordion = function(id, event) {
+                if (event) { 
+                    event.preventDefault(); 
+                    event.stopPropagation(); 
                 }
-            }
-            @media (max-width: 1199px) {
-                .controls {
-                    grid-template-columns: repeat(2, 1fr);  /* 2 columns for medium screens */
+                const content = document.getElementById(id);
+                const header = document.querySelector(`[data-target="${id}"]`);
+                if (!content || !header) {
+                    console.warn(`Could not find content or header for id: ${id}`);
+                    return;
                 }
-            }
+                
+                // Close the previously opened accordion, if any
+                if (window._openAccordionId && window._openAccordionId !== id) {
+                    document.getElementById(window._openAccordionId)?.classList.remove('show');
+                    const otherHeader = document.querySelector(`[data-target="${window._openAccordionId}"]`);
+                    if (otherHeader) {
+                        otherHeader.classList.remove('active');
+                        otherHeader.setAttribute('aria-expanded', 'false');
+                    }
+                }
+                
+                // Toggle current accordion
+                const isExpanding = !content.classList.contains('show');
+                if (isExpanding) window.hintWillChange(content, 'opacity');
+                content.classList.toggle('show');
+                header.classList.toggle('active');
+                header.setAttribute('aria-expanded', isExpanding);
+                window._openAccordionId = isExpanding ? id : null;
+            };
+
+            window.toggleRootCause = function(anomalyId, rootCauseId, event) {
+                if (event) { event.preventDefault(); event.stopPropagation(); }
+                const content = document.getElementById(`root-cause-content-${anomalyId}-${rootCauseId}`);
+                const header = document.getElementById(`root-cause-header-${anomalyId}-${rootCauseId}`);
+                if (!content || !header) return;
+                const icon = header.querySelector('.root-cause-toggle-icon');
+                content.classList.toggle('show');
+                if (content.classList.contains('show')) window.charts.initializeWithin(content);
+                if (icon) {
+                    window.hintWillChange(icon, 'transform');
+                    icon.style.transform = content.classList.contains('show') ? 'rotate(180deg)' : 'rotate(0deg)';
+                }
+            };
+
+            window.openEmailClient = function(event) {
+                if (event) { event.preventDefault(); event.stopPropagation(); }
+                try {
+                    const anomalyContainer = event?.target?.closest('.accordion-item');
+                    if (!anomalyContainer) throw new Error('Anomaly not found');
+                    const ds = anomalyContainer.dataset;
+                    const anomalyId = ds.anomalyId || 'Unknown';
+                    let body = `AWS Cost Anomaly Alert\n\nAnomaly ID: ${anomalyId}\nDate Range: ${ds.dateRange}\nTotal Cost Impact: ${ds.totalCost}\nDuration: ${ds.duration}\nTotal Cost: ${ds.totalCost}\nAverage Daily Cost: ${ds.avgDaily}\nCurrency: ${ds.currency}`;
+                    window.location.href = `mailto:?subject=${encodeURIComponent('AWS Cost Anomaly Alert: ' + anomalyId)}&body=${encodeURIComponent(body)}`;
+                } catch (err) {
+                    console.error('Error opening email client:', err);
+                    alert('Failed to open email client: ' + err.message);
+                }
+            };
+
+            window.debounce = function(fn, wait) {
+                let timer = null;
+                return function(...args) {
+                    clearTimeout(timer);
+                    timer = setTimeout(() => fn.apply(this, args), wait);
+                };
+            };
+
+            // The generator pre-serializes the filter fields, in template order
+            window.buildAnomalyIndex = function() {
+                const templates = document.querySelectorAll('template.anomaly-template');
+                const payload = JSON.parse(document.getElementById('anomalies')?.textContent || '[]');
+                window.anomalyIndex = payload.map((rec, i) => ({
+                    tpl: templates[i],
+                    haystack: rec.haystack,
+                    costImpact: rec.cost_impact,
+                    startMs: rec.start_ms,
+                    endMs: rec.end_ms,
+                    services: new Set(rec.services),
+                    accounts: new Set(rec.accounts)
+                }));
+            };
+
+            // Initialize when DOM is loaded
+            document.addEventListener('DOMContentLoaded', function() {
+                try {
+                    // Create the date picker the first time the field is focused
+                    const dateRangeInput = document.getElementById('dateRange');
+                    dateRangeInput?.addEventListener('focus', function() {
+                        if (!window.flatpickr) return;
+                        window.dateRangePicker = flatpickr(dateRangeInput, {
+                            mode: "range",
+                            dateFormat: "Y-m-d",
+                            altInput: true,
+                            altFormat: "F j, Y",
+                            placeholder: "Select date range...",
+                            allowInput: true,
+                            onChange: function(selectedDates) {
+                                if (selectedDates.length === 2) {
+                                    const startDate = selectedDates[0].toISOString().split('T')[0];
+                                    const endDate = selectedDates[1].toISOString().split('T')[0];
+                                    dateRangeInput.value = `${startDate} to ${endDate}`;
+                                    window.filterAnomalies();
+                                }
+                            }
+                        });
+                        window.dateRangePicker.open();
+                    }, { once: true });
+
+                    // Initialize filter listeners
+                    ['searchText', 'minCost', 'maxCost', 'serviceFilter', 'linkedAccountFilter'].forEach(id => {
+                        const el = document.getElementById(id);
+                        if (el) {
+                            if (id === 'searchText') {
+                                el.addEventListener('input', window.debounce(window.filterAnomalies, 100));
+                            } else {
+                                el.addEventListener('change', window.filterAnomalies);
+                            }
+                        }
+                    });
+
+                    // Route clicks on anomaly items through a single listener
+                    document.getElementById('anomalyAccordion')?.addEventListener('click', function(e) {
+                        const shareIcon = e.target.closest('.share-icon');
+                        if (shareIcon) {
+                            window.openEmailClient(e);
+                            return;
+                        }
+                        const rootCauseHeader = e.target.closest('.root-cause-header');
+                        if (rootCauseHeader) {
+                            window.toggleRootCause(rootCauseHeader.dataset.anomalyIndex, rootCauseHeader.dataset.rootCauseIndex, e);
+                            return;
+                        }
+                        const header = e.target.closest('.accordion-header');
+                        if (header) {
+                            window.toggleAccordion(header.dataset.target, e);
+                        }
+                    });
+
+                    // Initialize pagination
+                    window.buildAnomalyIndex();
+                    window.filteredItems = window.anomalyIndex.slice();
+                    window.currentPage = 1;
+                    window.itemsPerPage = 5;
+                    window.updatePagination();
+                    window.updateFilterSummary();
+                } catch (err) {
+                    console.error('Error during initialization:', err);
+                }
+            });
+
+            // Attach remaining functions to window
+            window.filterAnomalies = function() {
+                try {
+                    const searchTextLower = (document.getElementById('searchText')?.value || '').toLowerCase().trim();
+                    const dateRange = document.getElementById('dateRange')?.value || '';
+                    const minCost = parseFloat(document.getElementById('minCost')?.value) || 0;
+                    const maxCost = parseFloat(document.getElementById('maxCost')?.value) || Infinity;
+                    const serviceFilter = document.getElementById('serviceFilter')?.value || '';
+                    const linkedAccountFilter = document.getElementById('linkedAccountFilter')?.value || '';
+                    let filterStart = null, filterEnd = null;
+                    if (dateRange && dateRange.includes(' to ')) {
+                        const [filterStartStr, filterEndStr] = dateRange.split(' to ').map(d => d.trim());
+                        if (filterStartStr && filterEndStr) {
+                            filterStart = new Date(filterStartStr).getTime();
+                            const filterEndDate = new Date(filterEndStr);
+                            filterEndDate.setHours(23, 59, 59, 999);
+                            filterEnd = filterEndDate.getTime();
+                        }
+                    }
+                    const index = window.anomalyIndex;
+                    const filtered = [];
+                    for (let i = 0; i < index.length; i++) {
+                        const rec = index[i];
+                        const matchesSearch = !searchTextLower || rec.haystack.indexOf(searchTextLower) !== -1;
+                        const matchesDate = filterStart === null ||
+                            (rec.startMs <= filterEnd && rec.endMs >= filterStart);
+                        const matchesCost = rec.costImpact >= minCost && rec.costImpact <= maxCost;
+                        const matchesService = !serviceFilter || rec.services.has(serviceFilter);
+                        const matchesLinkedAccount = !linkedAccountFilter || rec.accounts.has(linkedAccountFilter);
+                        if (matchesSearch && matchesDate && matchesCost && matchesService && matchesLinkedAccount) {
+                            filtered.push(rec);
+                        }
+                    }
+                    window.filteredItems = filtered;
+                    window.currentPage = 1;
+                    window.updatePagination();
+                    window.updateFilterSummary();
+                } catch (err) {
+                    console.error('Error in filterAnomalies:', err);
+                }
+            };
+
+            window.clearFilters = function() {
+                ['searchText', 'minCost', 'maxCost', 'serviceFilter', 'linkedAccountFilter'].forEach(id => {
+                    const el = document.getElementById(id);
+                    if (el) el.value = '';
+                });
+                if (window.dateRangePicker) window.dateRangePicker.clear();
+                window.filteredItems = window.anomalyIndex.slice();
+                window.currentPage = 1;
+                window.updatePagination();
+                window.updateFilterSummary();
+            };
+
+            window.updateFilterSummary = function() {
+                const filterSummary = document.getElementById('filterSummary');
+                if (filterSummary) {
+                    filterSummary.textContent = `Showing ${window.filteredItems.length} of ${window.anomalyIndex.length} anomalies`;
+                }
+            };
+
+            // Coalesce page renders so several state changes in one tick cost a single DOM swap
+            window.updatePagination = function() {
+                if (window._paginationFrame) return;
+                window._paginationFrame = requestAnimationFrame(() => {
+                    window._paginationFrame = null;
+                    window.renderPage();
+                });
+            };
+
+            window.renderPage = function() {
+                const start = (window.currentPage - 1) * window.itemsPerPage;
+                const end = start + window.itemsPerPage;
+                const container = document.getElementById('anomalyAccordion');
+                // Release the charts of the page being replaced
+                container.querySelectorAll('canvas').forEach(canvas => {
+                    if (window.chartInstances && window.chartInstances[canvas.id]) {
+                        window.chartInstances[canvas.id].destroy();
+                        delete window.chartInstances[canvas.id];
+                    }
+                });
+                // Only the current page is materialized from its template
+                const fragment = document.createDocumentFragment();
+                window.filteredItems.slice(start, end).forEach(rec => {
+                    const item = document.importNode(rec.tpl.content, true).firstElementChild;
+                    fragment.appendChild(item);
+                });
+                container.replaceChildren(fragment);
+                window.updatePaginationControls();
+            };
+
+            window.updatePaginationControls = function() {
+                const totalPages = Math.ceil(window.filteredItems.length / window.itemsPerPage);
+                const paginationContainer = document.getElementById('pagination');
+                const pageInfo = document.getElementById('pageInfo');
+                if (!paginationContainer || !pageInfo) return;
+                const start = (window.currentPage - 1) * window.itemsPerPage + 1;
+                const end = Math.min(window.currentPage * window.itemsPerPage, window.filteredItems.length);
+                pageInfo.textContent = `Showing ${start}-${end} of ${window.filteredItems.length} anomalies`;
+                let paginationHTML = '';
+                paginationHTML += `<button class="pagination-btn" onclick="changePage(${window.currentPage - 1})" ${window.currentPage === 1 ? 'disabled' : ''}>Previous</button>`;
+                for (let i = 1; i <= totalPages; i++) {
+                    if (i === 1 || i === totalPages || (i >= window.currentPage - 2 && i <= window.currentPage + 2)) {
+                        paginationHTML += `<button class="pagination-btn ${i === window.currentPage ? 'active' : ''}" onclick="changePage(${i})">${i}</button>`;
+                    } else if ((i === window.currentPage - 3 && window.currentPage > 4) || (i === window.currentPage + 3 && window.currentPage < totalPages - 3)) {
+                        paginationHTML += `<span class="pagination-ellipsis">...</span>`;
+                    }
+                }
+                paginationHTML += `<button class="pagination-btn" onclick="changePage(${window.currentPage + 1})" ${window.currentPage === totalPages ? 'disabled' : ''}>Next</button>`;
+                paginationContainer.innerHTML = paginationHTML;
+            };
+
+            window.changePage = function(newPage) {
+                const totalPages = Math.ceil(window.filteredItems.length / window.itemsPerPage);
+                if (newPage < 1 || newPage > totalPages) return;
+                window.currentPage = newPage;
+                window.updatePagination();
+            };
+
+            window.changeItemsPerPage = function(newValue) {
+                const value = parseInt(newValue);
+                if (isNaN(value) || value < 1) return;
+                window.itemsPerPage = value;
+                window.currentPage = 1;
+                window.updatePagination();
+            };
+        </script>
+    </head>
+    <body>
+        <h1>AWS Cost Anomalies Report</h1>
+        <div class="controls">
+            <div class="filter-group">
+                <label for="searchText">Search Anomalies</label>
+                <input type="text" id="searchText" class="filter-input" placeholder="Search by ID, date, or amount...">
+            </div>
+            <div class="filter-group">
+                <label for="dateRange">Date Range</label>
+                <input type="text" id="dateRange" class="filter-input" placeholder="Select date range...">
+            </div>
+            <div class="filter-group">
+                <label for="minCost">Min Cost ($)</label>
+                <input type="number" id="minCost" class="filter-input" placeholder="Min cost..." min="0" step="0.01">
+            </div>
+            <div class="filter-group">
+                <label for="maxCost">Max Cost ($)</label>
+                <input type="number" id="maxCost" class="filter-input" placeholder="Max cost..." min="0" step="0.01">
+            </div>
+            <div class="filter-group">
+                <label for="serviceFilter">Service</label>
+                <span class="select-wrap">
+                <select id="serviceFilter" class="filter-input">
+                    <option value="">All Services</option>
+    """
+
+REPORT_CSS = """
+            .controls { 
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+                gap: 20px;
+                margin-bottom: 30px;
+                padding: 25px;
+                background: white;
+                border-radius: 8px;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                max-width: 90%;  /* Match accordion width */
+                margin-left: auto;
+                margin-right: auto;
+            }
+            .filter-group {
+                display: flex;
+                flex-direction: column;
+                gap: 8px;
+                min-width: 0;  /* Allow shrinking */
+            }
+            .filter-group label {
+                font-size: 0.9em;
+                color: #666;
+                font-weight: bold;
+                margin-bottom: 2px;
+            }
+            .filter-input {
+                padding: 8px 12px;
+                font-size: 0.9em;
+                border: 1px solid #ddd;
+                border-radius: 4px;
+                width: 100%;
+                box-sizing: border-box;
+                height: 38px;  /* Match height with buttons */
+            }
+            .filter-input:focus {
+                border-color: #4682b4;
+                outline: none;
+                box-shadow: 0 0 0 2px rgba(70,130,180,0.2);
+            }
+            .export-group {
+                display: flex;
+                gap: 12px;
+                grid-column: 1 / -1;
+                justify-content: flex-end;
+                margin-top: 10px;
+                padding-top: 15px;
+                border-top: 1px solid #e6f0f7;
+                align-items: center;  /* Align buttons vertically */
+            }
+            .export-btn {
+                padding: 8px 12px;  /* Increased padding */
+                font-size: 0.9em;
+                border-radius: 4px;
+                border: none;
+                background: #4682b4;
+                color: white;
+                cursor: pointer;
+                display: inline-flex;
+                align-items: center;
+                gap: 6px;
+                transition: all 0.2s;
+                min-width: 160px;
+                justify-content: center;
+                height: 38px;  /* Increased height to match dropdown */
+                line-height: 1.2;  /* Added line height for better text alignment */
+            }
+            .export-btn:hover {
+                background: #3a6a9a;
+                transform: translateY(-1px);
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            }
+            .export-btn:active {
+                background: #2c5282;
+                transform: translateY(0);
+            }
+            .export-btn span {
+                font-size: 1.1em;
+            }
+            .email-btn {
+                padding: 4px 8px;
+                font-size: 0.85em;
+                border-radius: 4px;
+                border: 1px solid #4682b4;
+                background: white;
+                color: #4682b4;
+                cursor: pointer;
+                display: inline-flex;
+                align-items: center;
+                gap: 4px;
+                transition: all 0.2s;
+                margin-left: 10px;
+            }
+            .email-btn:hover {
+                background: #f0f7fc;
+                border-color: #3a6a9a;
+                color: #3a6a9a;
+            }
+            .email-btn:active {
+                background: #e6f0f7;
+            }
+            .email-btn span {
+                font-size: 1.1em;
+            }
+            #filterSummary {
+                grid-column: 1 / -1;  /* Span all columns */
+                text-align: right;
+                color: #666;
+                font-size: 0.9em;
+                margin-top: 10px;
+                padding-top: 10px;
+                border-top: 1px solid #e6f0f7;
+            }
+            @media (min-width: 1200px) {
+                .controls {
+                    grid-template-columns: repeat(5, 1fr);  /* 5 columns for larger screens */
+                }
+                .export-group {
+                    grid-column: auto;  /* Don't span all columns on large screens */
+                    border-top: none;
+                    margin-top: 0;
+                    padding-top: 0;
+                }
+            }
+            @media (max-width: 1199px) {
+                .controls {
+                    grid-template-columns: repeat(2, 1fr);  /* 2 columns for medium screens */
+                }
+            }
             @media (max-width: 767px) {
                 .controls {
                     grid-template-columns: 1fr;  /* 1 column for small screens */
@@ -549,14 +1036,6 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 display: none;
                 padding: 20px 24px;
                 background: #f9f9f9;
-                animation: fadeIn 0.3s;
-            }
-            .accordion-content.show {
-                display: block;
-            }
-            @keyframes fadeIn {
-                from { opacity: 0; }
-                to { opacity: 1; }
             }
             table {
                 border-collapse: collapse;
@@ -587,25 +1066,35 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
             tr:nth-child(even) {
                 background-color: #f9f9f9;
             }
-            .root-cause {
+            .rc-card {
                 background: #fff;
                 border: 1px solid #e6f0f7;
                 border-radius: 8px;
                 margin-bottom: 15px;
-                padding: 15px;
+                padding: 20px;
                 max-width: 85%;
                 margin-left: 0;
                 margin-right: auto;
+                overflow: hidden;
             }
             .root-cause-header {
                 display: flex;
+                justify-content: space-between;
                 align-items: center;
-                padding: 12px 15px;
+                padding: 15px 20px 10px;
                 cursor: pointer;
                 background: #f0f7fc;
+                color: #2c3e50;
+                font-size: 1em;
+                font-weight: 600;
+                border: none;
+                border-bottom: 1px solid #e6f0f7;
                 border-radius: 6px;
-                margin-bottom: 12px;
+                outline: none;
+                margin-bottom: 15px;
                 width: 100%;
+                text-align: left;
+                transition: all 0.2s;
             }
             .root-cause-toggle-icon {
                 font-size: 1em;
@@ -621,14 +1110,14 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 text-align: left;
             }
             .root-cause-title {
-                font-size: 1em;
+                font-size: 1.1em;
                 font-weight: 600;
                 color: #2c3e50;
-                margin-bottom: 4px;
+                margin-bottom: 5px;
                 text-align: left;
             }
             .root-cause-subtitle {
-                font-size: 0.85em;
+                font-size: 0.9em;
                 color: #666;
                 text-align: left;
             }
@@ -645,7 +1134,7 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 font-size: 0.9em;  /* Reduced font size */
             }
             .root-cause-table th,
-            .root-cause-table td {
+            .rc-cell {
                 padding: 10px 12px;  /* Reduced padding */
                 font-size: 0.9em;  /* Reduced font size */
             }
@@ -664,12 +1153,9 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
             .root-cause-table th:last-child {
                 border-top-right-radius: 8px;
             }
-            .root-cause-table tr:last-child td {
+            .rc-row:last-child > .rc-cell {
                 border-bottom: none;
             }
-            .root-cause-table tr:hover td {
-                background: #f5f9fc;
-            }
             .tags-cell {
                 display: flex;
                 gap: 8px;
@@ -779,7 +1265,7 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
             }
 
             .info-table th,
-            .info-table td {
+            .info-cell {
                 padding: 15px;
                 text-align: left;
                 border-bottom: 1px solid #e6f0f7;
@@ -803,14 +1289,10 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 border-top-right-radius: 8px;
             }
 
-            .info-table tr:last-child td {
+            .info-row:last-child > .info-cell {
                 border-bottom: none;
             }
 
-            .info-table tr:hover td {
-                background: #f5f9fc;  /* Very light steel blue */
-            }
-
             .root-cause-table {
                 width: 100%;
                 border-collapse: separate;
@@ -823,7 +1305,7 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
             }
 
             .root-cause-table th,
-            .root-cause-table td {
+            .rc-cell {
                 padding: 12px 15px;
                 text-align: left;
                 border-bottom: 1px solid #e6f0f7;
@@ -848,14 +1330,10 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 border-top-right-radius: 8px;
             }
 
-            .root-cause-table tr:last-child td {
+            .rc-row:last-child > .rc-cell {
                 border-bottom: none;
             }
 
-            .root-cause-table tr:hover td {
-                background: #f5f9fc;  /* Very light steel blue */
-            }
-
             .tags-cell {
                 display: flex;
                 gap: 8px;
@@ -885,44 +1363,18 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
             }
 
             /* Update table row hover to be more subtle */
-            .info-table tr:hover td,
-            .root-cause-table tr:hover td {
+            .info-row:hover > .info-cell,
+            .rc-row:hover > .rc-cell {
                 background: #f5f9fc;  /* Very light steel blue */
             }
 
             /* Add subtle border to table cells */
-            .info-table td,
-            .root-cause-table td {
+            .info-cell,
+            .rc-cell {
                 border-bottom: 1px solid #e6f0f7;
             }
 
             /* Nested accordion styles */
-            .root-cause-accordion {
-                margin: 15px 0;
-                border-radius: 8px;
-                overflow: hidden;
-                background: #fff;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-            }
-
-            .root-cause-header {
-                background: #f0f7fc;  /* Lighter steel blue */
-                color: #2c3e50;
-                cursor: pointer;
-                padding: 15px 20px;
-                font-size: 1em;
-                font-weight: 600;
-                transition: all 0.2s;
-                outline: none;
-                border: none;
-                width: 100%;
-                text-align: left;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                border-bottom: 1px solid #e6f0f7;
-            }
-
             .root-cause-header:hover,
             .root-cause-header.active {
                 background: #e6f0f7;  /* Slightly darker on hover */
@@ -932,11 +1384,6 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 display: none;
                 padding: 20px;
                 background: #fff;
-                animation: fadeIn 0.3s;
-            }
-
-            .root-cause-content.show {
-                display: block;
             }
 
             .root-cause-summary {
@@ -973,25 +1420,19 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 font-weight: 600;
             }
 
-            /* Update existing root-cause styles */
-            .root-cause {
-                background-color: #fff;
-                margin-bottom: 15px;
-                border-radius: 8px;
-                overflow: hidden;
-            }
-
             .root-causes-container {
                 margin: 20px 0;
             }
 
             .root-causes-toggle {
                 display: flex;
+                justify-content: space-between;
                 align-items: center;
                 gap: 10px;
                 margin-bottom: 15px;
-                padding: 10px 15px;
+                padding: 12px 20px;
                 background: #f0f7fc;
+                border: 1px solid #e6f0f7;
                 border-radius: 6px;
                 cursor: pointer;
                 user-select: none;
@@ -1003,7 +1444,7 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
 
             .root-causes-toggle-icon {
                 font-size: 1.2em;
-                transition: transform 0.3s;
+                transition: transform 0.2s;
             }
 
             .root-causes-toggle-icon.expanded {
@@ -1017,33 +1458,6 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
 
             .root-causes-content.show {
                 display: block;
-                animation: fadeIn 0.3s;
-            }
-
-            .root-cause-item {
-                background: #fff;
-                border: 1px solid #e6f0f7;
-                border-radius: 8px;
-                margin-bottom: 15px;
-                overflow: hidden;
-            }
-
-            .root-cause-header {
-                background: #f8fafc;
-                padding: 15px 20px;
-                border-bottom: 1px solid #e6f0f7;
-            }
-
-            .root-cause-title {
-                font-size: 1.1em;
-                font-weight: 600;
-                color: #2c3e50;
-                margin-bottom: 5px;
-            }
-
-            .root-cause-subtitle {
-                color: #666;
-                font-size: 0.9em;
             }
 
             .root-cause-details {
@@ -1075,90 +1489,51 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
                 color: #2c3e50;
             }
 
-            .cost-impact {
-                color: #e74c3c;
-                font-weight: 600;
-            }
-
-            .root-causes-section {
-                margin: 20px 0;
-            }
-
-            .root-causes-toggle {
-                background: #f0f7fc;
-                padding: 12px 20px;
-                border-radius: 6px;
-                cursor: pointer;
-                margin-bottom: 15px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                border: 1px solid #e6f0f7;
-            }
-
-            .root-causes-toggle:hover {
-                background: #e6f0f7;
-            }
-
-            .root-causes-toggle-text {
-                font-weight: 600;
-                color: #2c3e50;
-            }
-
-            .root-causes-toggle-icon {
-                font-size: 1.2em;
-                transition: transform 0.2s;
-            }
-
-            .root-causes-toggle-icon.expanded {
-                transform: rotate(180deg);
-            }
-
-            .root-causes-list {
-                display: none;
-                margin-top: 15px;
-            }
-
-            .root-causes-list.show {
-                display: block;
-            }
-
-            .root-cause {
-                background: #fff;
-                border: 1px solid #e6f0f7;
-                border-radius: 8px;
-                margin-bottom: 15px;
-                padding: 20px;
+            .cost-impact {
+                color: #e74c3c;
+                font-weight: 600;
             }
 
-            .root-cause-header {
-                margin-bottom: 15px;
-                padding-bottom: 10px;
-                border-bottom: 1px solid #e6f0f7;
+            .root-causes-section {
+                margin: 20px 0;
             }
 
-            .root-cause-title {
-                font-size: 1.1em;
+            .root-causes-toggle-text {
                 font-weight: 600;
                 color: #2c3e50;
-                margin-bottom: 5px;
             }
 
-            .root-cause-subtitle {
-                color: #666;
-                font-size: 0.9em;
+            .root-causes-list {
+                display: none;
+                margin-top: 15px;
             }
 
-            .accordion-content {
-                display: none;
+            .root-causes-list.show {
+                display: block;
+            }
+
+            .accordion-content,
+            .root-cause-content,
+            .root-causes-content {
                 opacity: 0;
                 transition: opacity 0.3s ease-in-out;
             }
-            
-            .accordion-content.show {
+
+            .accordion-content.show,
+            .root-cause-content.show,
+            .root-causes-content.show {
                 display: block;
                 opacity: 1;
             }
+
+            /* Fade in from opacity 0 when the show class switches display on */
+            @starting-style {
+                .accordion-content.show,
+                .root-cause-content.show,
+                .root-causes-content.show {
+                    opacity: 0;
+                }
+            }
             
             .accordion-header {
                 position: relative;
@@ -1176,13 +1551,29 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
 
             select.filter-input {
                 appearance: none;
-                background-image: url("data:image/svg+xml;charset=UTF-8,%3csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='currentColor' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3e%3cpolyline points='6 9 12 15 18 9'%3e%3c/polyline%3e%3c/svg%3e");
-                background-repeat: no-repeat;
-                background-position: right 8px center;
-                background-size: 16px;
                 padding-right: 32px;
             }
 
+            /* Dropdown chevron drawn with borders on the wrapper */
+            .select-wrap {
+                position: relative;
+                display: block;
+            }
+
+            .select-wrap::after {
+                content: '';
+                position: absolute;
+                top: 50%;
+                right: 14px;
+                width: 6px;
+                height: 6px;
+                margin-top: -5px;
+                border-right: 2px solid currentColor;
+                border-bottom: 2px solid currentColor;
+                transform: rotate(45deg);
+                pointer-events: none;
+            }
+
             /* Email modal styles */
             .email-modal {
                 display: none;
@@ -1203,488 +1594,113 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
 
             .email-modal-content {
                 background: white;
-                padding: 25px;
-                border-radius: 8px;
-                width: 90%;
-                max-width: 500px;
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-            }
-
-            .email-modal-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 20px;
-            }
-
-            .email-modal-title {
-                font-size: 1.2em;
-                font-weight: bold;
-                color: #2c3e50;
-            }
-
-            .email-modal-close {
-                cursor: pointer;
-                font-size: 1.5em;
-                color: #666;
-                padding: 4px;
-                line-height: 1;
-            }
-
-            .email-form {
-                display: flex;
-                flex-direction: column;
-                gap: 15px;
-            }
-
-            .email-form-group {
-                display: flex;
-                flex-direction: column;
-                gap: 5px;
-            }
-
-            .email-form-group label {
-                font-size: 0.9em;
-                color: #666;
-                font-weight: bold;
-            }
-
-            .email-form-group input,
-            .email-form-group textarea {
-                padding: 8px 12px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                font-size: 0.9em;
-            }
-
-            .email-form-group textarea {
-                min-height: 100px;
-                resize: vertical;
-            }
-
-            .email-form-actions {
-                display: flex;
-                justify-content: flex-end;
-                gap: 10px;
-                margin-top: 10px;
-            }
-
-            .email-btn {
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-size: 0.9em;
-                cursor: pointer;
-                transition: all 0.2s;
-            }
-
-            .email-btn-primary {
-                background: #4682b4;
-                color: white;
-                border: none;
-            }
-
-            .email-btn-secondary {
-                background: white;
-                color: #666;
-                border: 1px solid #ddd;
-            }
-
-            .email-btn:hover {
-                opacity: 0.9;
-                transform: translateY(-1px);
-            }
-        </style>
-        <script>
-            // Define charts object first and attach to window immediately
-            window.charts = {
-                initialize: function(chartId, labels, data) {
-                    try {
-                        if (!chartId || !Array.isArray(labels) || !Array.isArray(data)) {
-                            console.warn('Invalid parameters for chart initialization');
-                            return;
-                        }
-                        const ctx = document.getElementById(chartId);
-                        if (!ctx) {
-                            console.warn(`Chart canvas not found: ${chartId}`);
-                            return;
-                        }
-                        if (window.chartInstances && window.chartInstances[chartId]) {
-                            window.chartInstances[chartId].destroy();
-                        }
-                        const chart = new Chart(ctx.getContext('2d'), {
-                            type: 'line',
-                            data: {
-                                labels: labels,
-                                datasets: [{
-                                    label: 'Cost',
-                                    data: data,
-                                    borderColor: '#4682b4',
-                                    backgroundColor: 'rgba(70,130,180,0.1)',
-                                    fill: true,
-                                    tension: 0.2
-                                }]
-                            },
-                            options: {
-                                responsive: true,
-                                maintainAspectRatio: false,
-                                plugins: {
-                                    legend: { display: false },
-                                    tooltip: {
-                                        callbacks: {
-                                            label: function(context) {
-                                                return '$' + parseFloat(context.raw).toFixed(2);
-                                            }
-                                        }
-                                    }
-                                },
-                                scales: {
-                                    x: { 
-                                        title: { display: true, text: 'Date', font: { weight: 'bold' } }
-                                    },
-                                    y: { 
-                                        title: { display: true, text: 'Amount (USD)', font: { weight: 'bold' } },
-                                        ticks: {
-                                            callback: function(value) {
-                                                return '$' + value.toFixed(2);
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        });
-                        if (!window.chartInstances) window.chartInstances = {};
-                        window.chartInstances[chartId] = chart;
-                    } catch (error) {
-                        console.error(`Error initializing chart ${chartId}:`, error);
-                    }
-                }
-            };
-
-            // Define and attach all other functions to window immediately
-            window.toggleAccordion = function(id, event) {
-                if (event) { 
-                    event.preventDefault(); 
-                    event.stopPropagation(); 
-                }
-                const content = document.getElementById(id);
-                const header = document.querySelector(`[data-target="${id}"]`);
-                if (!content || !header) {
-                    console.warn(`Could not find content or header for id: ${id}`);
-                    return;
-                }
-                
-                // Close all other accordions first
-                document.querySelectorAll('.accordion-content.show').forEach(item => {
-                    if (item.id !== id) {
-                        item.classList.remove('show');
-                        const otherHeader = document.querySelector(`[data-target="${item.id}"]`);
-                        if (otherHeader) {
-                            otherHeader.classList.remove('active');
-                            otherHeader.setAttribute('aria-expanded', 'false');
-                        }
-                    }
-                });
-                
-                // Toggle current accordion
-                const isExpanding = !content.classList.contains('show');
-                content.classList.toggle('show');
-                header.classList.toggle('active');
-                header.setAttribute('aria-expanded', isExpanding);
-                
-                // Log for debugging
-                console.log(`Toggled accordion ${id}, isExpanding: ${isExpanding}`);
-            };
-
-            window.toggleRootCause = function(anomalyId, rootCauseId, event) {
-                if (event) { event.preventDefault(); event.stopPropagation(); }
-                const content = document.getElementById(`root-cause-content-${anomalyId}-${rootCauseId}`);
-                const header = document.getElementById(`root-cause-header-${anomalyId}-${rootCauseId}`);
-                if (!content || !header) return;
-                const icon = header.querySelector('.root-cause-toggle-icon');
-                content.classList.toggle('show');
-                if (icon) {
-                    icon.style.transform = content.classList.contains('show') ? 'rotate(180deg)' : 'rotate(0deg)';
-                }
-            };
-
-            window.openEmailClient = function(idx, event) {
-                if (event) { event.preventDefault(); event.stopPropagation(); }
-                try {
-                    const anomalyContainer = document.querySelectorAll('.accordion-item')[idx];
-                    if (!anomalyContainer) throw new Error('Anomaly not found');
-                    const header = anomalyContainer.querySelector('.accordion-header');
-                    const content = anomalyContainer.querySelector('.accordion-content');
-                    if (!header || !content) throw new Error('Header/content not found');
-                    const anomalyId = header.querySelector('.header-value')?.textContent?.trim() || 'Unknown';
-                    const dateText = header.querySelectorAll('.header-value')[1]?.textContent?.trim() || 'Unknown';
-                    const costText = header.querySelectorAll('.header-value')[2]?.textContent?.trim() || 'Unknown';
-                    const infoTable = content.querySelector('.info-table');
-                    const duration = infoTable?.querySelector('tr:nth-child(2) td:nth-child(1)')?.textContent?.trim() || 'Unknown';
-                    const totalCost = infoTable?.querySelector('tr:nth-child(2) td:nth-child(2)')?.textContent?.trim() || 'Unknown';
-                    const avgDailyCost = infoTable?.querySelector('tr:nth-child(2) td:nth-child(3)')?.textContent?.trim() || 'Unknown';
-                    const currency = infoTable?.querySelector('tr:nth-child(2) td:nth-child(4)')?.textContent?.trim() || 'Unknown';
-                    let body = `AWS Cost Anomaly Alert\n\nAnomaly ID: ${anomalyId}\nDate Range: ${dateText}\nTotal Cost Impact: ${costText}\nDuration: ${duration}\nTotal Cost: ${totalCost}\nAverage Daily Cost: ${avgDailyCost}\nCurrency: ${currency}`;
-                    window.location.href = `mailto:?subject=${encodeURIComponent('AWS Cost Anomaly Alert: ' + anomalyId)}&body=${encodeURIComponent(body)}`;
-                } catch (err) {
-                    console.error('Error opening email client:', err);
-                    alert('Failed to open email client: ' + err.message);
-                }
-            };
-
-            // Initialize when DOM is loaded
-            document.addEventListener('DOMContentLoaded', function() {
-                try {
-                    // Initialize date picker
-                    const dateRangeInput = document.getElementById('dateRange');
-                    if (dateRangeInput && window.flatpickr) {
-                        window.dateRangePicker = flatpickr(dateRangeInput, {
-                            mode: "range",
-                            dateFormat: "Y-m-d",
-                            altInput: true,
-                            altFormat: "F j, Y",
-                            placeholder: "Select date range...",
-                            allowInput: true,
-                            onChange: function(selectedDates) {
-                                if (selectedDates.length === 2) {
-                                    const startDate = selectedDates[0].toISOString().split('T')[0];
-                                    const endDate = selectedDates[1].toISOString().split('T')[0];
-                                    dateRangeInput.value = `${startDate} to ${endDate}`;
-                                    window.filterAnomalies();
-                                }
-                            }
-                        });
-                    }
+                padding: 25px;
+                border-radius: 8px;
+                width: 90%;
+                max-width: 500px;
+                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
+            }
 
-                    // Initialize filter listeners
-                    ['searchText', 'minCost', 'maxCost', 'serviceFilter', 'linkedAccountFilter'].forEach(id => {
-                        const el = document.getElementById(id);
-                        if (el) {
-                            const eventType = id === 'searchText' ? 'input' : 'change';
-                            el.addEventListener(eventType, window.filterAnomalies);
-                        }
-                    });
+            .email-modal-header {
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                margin-bottom: 20px;
+            }
 
-                    // Initialize accordion listeners with improved event handling
-                    document.querySelectorAll('.accordion-header').forEach(header => {
-                        const targetId = header.getAttribute('data-target');
-                        if (targetId) {
-                            header.addEventListener('click', function(e) {
-                                // Don't toggle if clicking the email icon
-                                if (e.target.closest('.share-icon')) {
-                                    return;
-                                }
-                                // Prevent event bubbling
-                                e.preventDefault();
-                                e.stopPropagation();
-                                // Toggle the accordion
-                                window.toggleAccordion(targetId, e);
-                            });
-                        }
-                    });
+            .email-modal-title {
+                font-size: 1.2em;
+                font-weight: bold;
+                color: #2c3e50;
+            }
 
-                    // Initialize email listeners separately
-                    document.querySelectorAll('.share-icon').forEach(icon => {
-                        icon.addEventListener('click', function(e) {
-                            e.preventDefault();
-                            e.stopPropagation();
-                            const anomalyItem = icon.closest('.accordion-item');
-                            if (anomalyItem) {
-                                const index = Array.from(document.querySelectorAll('.accordion-item')).indexOf(anomalyItem);
-                                window.openEmailClient(index, e);
-                            }
-                        });
-                    });
+            .email-modal-close {
+                cursor: pointer;
+                font-size: 1.5em;
+                color: #666;
+                padding: 4px;
+                line-height: 1;
+            }
 
-                    // Initialize pagination
-                    window.filteredItems = Array.from(document.querySelectorAll('.accordion-item'));
-                    window.currentPage = 1;
-                    window.itemsPerPage = 5;
-                    window.updatePagination();
-                    window.updateFilterSummary();
-                } catch (err) {
-                    console.error('Error during initialization:', err);
-                }
-            });
+            .email-form {
+                display: flex;
+                flex-direction: column;
+                gap: 15px;
+            }
 
-            // Attach remaining functions to window
-            window.filterAnomalies = function() {
-                try {
-                    const searchText = (document.getElementById('searchText')?.value || '').toLowerCase().trim();
-                    const dateRange = document.getElementById('dateRange')?.value || '';
-                    const minCost = parseFloat(document.getElementById('minCost')?.value) || 0;
-                    const maxCost = parseFloat(document.getElementById('maxCost')?.value) || Infinity;
-                    const serviceFilter = document.getElementById('serviceFilter')?.value || '';
-                    const linkedAccountFilter = document.getElementById('linkedAccountFilter')?.value || '';
-                    const items = Array.from(document.querySelectorAll('.accordion-item'));
-                    window.filteredItems = items.filter(item => {
-                        const header = item.querySelector('.accordion-header');
-                        const content = item.querySelector('.accordion-content');
-                        if (!header || !content) return false;
-                        const anomalyId = header.querySelector('.header-value')?.textContent?.trim() || '';
-                        const dateText = header.querySelectorAll('.header-value')[1]?.textContent?.trim() || '';
-                        const costText = header.querySelectorAll('.header-value')[2]?.textContent?.trim() || '';
-                        const costImpact = parseFloat(costText.replace(/[$,]/g, '')) || 0;
-                        const [startDateStr, endDateStr] = dateText.split(' to ').map(d => d.trim());
-                        const anomalyStart = new Date(startDateStr);
-                        const anomalyEnd = new Date(endDateStr);
-                        let filterStart = null, filterEnd = null;
-                        if (dateRange && dateRange.includes(' to ')) {
-                            const [filterStartStr, filterEndStr] = dateRange.split(' to ').map(d => d.trim());
-                            if (filterStartStr && filterEndStr) {
-                                filterStart = new Date(filterStartStr);
-                                filterEnd = new Date(filterEndStr);
-                                if (filterEnd) filterEnd.setHours(23, 59, 59, 999);
-                            }
-                        }
-                        const services = Array.from(content.querySelectorAll('.root-cause'))
-                            .map(rc => rc.querySelector('.root-cause-title')?.textContent?.trim() || '')
-                            .filter(Boolean);
-                        const linkedAccounts = Array.from(content.querySelectorAll('.root-cause'))
-                            .map(rc => {
-                                const accountCell = rc.querySelector('td:nth-child(4)');
-                                if (!accountCell) return '';
-                                const accountText = accountCell.textContent.trim();
-                                const match = accountText.match(/(\d+)\s*\(([^)]+)\)/);
-                                return match ? `${match[1]} (${match[2]})` : accountText;
-                            })
-                            .filter(Boolean);
-                        const matchesSearch = !searchText || 
-                            anomalyId.toLowerCase().includes(searchText) ||
-                            dateText.toLowerCase().includes(searchText) ||
-                            costText.toLowerCase().includes(searchText);
-                        const matchesDate = !filterStart || !filterEnd || 
-                            (anomalyStart && anomalyEnd && anomalyStart <= filterEnd && anomalyEnd >= filterStart);
-                        const matchesCost = costImpact >= minCost && costImpact <= maxCost;
-                        const matchesService = !serviceFilter || services.some(service => service === serviceFilter);
-                        const matchesLinkedAccount = !linkedAccountFilter || linkedAccounts.some(account => account === linkedAccountFilter);
-                        return matchesSearch && matchesDate && matchesCost && matchesService && matchesLinkedAccount;
-                    });
-                    window.currentPage = 1;
-                    window.updatePagination();
-                    window.updateFilterSummary();
-                } catch (err) {
-                    console.error('Error in filterAnomalies:', err);
-                }
-            };
+            .email-form-group {
+                display: flex;
+                flex-direction: column;
+                gap: 5px;
+            }
 
-            window.clearFilters = function() {
-                ['searchText', 'minCost', 'maxCost', 'serviceFilter', 'linkedAccountFilter'].forEach(id => {
-                    const el = document.getElementById(id);
-                    if (el) el.value = '';
-                });
-                if (window.dateRangePicker) window.dateRangePicker.clear();
-                window.filteredItems = Array.from(document.querySelectorAll('.accordion-item'));
-                window.currentPage = 1;
-                window.updatePagination();
-                window.updateFilterSummary();
-            };
+            .email-form-group label {
+                font-size: 0.9em;
+                color: #666;
+                font-weight: bold;
+            }
 
-            window.updateFilterSummary = function() {
-                const visibleItems = document.querySelectorAll('.accordion-item[style=""]').length;
-                const totalItems = document.querySelectorAll('.accordion-item').length;
-                const filterSummary = document.getElementById('filterSummary');
-                if (filterSummary) {
-                    filterSummary.textContent = `Showing ${visibleItems} of ${totalItems} anomalies`;
-                }
-            };
+            .email-form-group input,
+            .email-form-group textarea {
+                padding: 8px 12px;
+                border: 1px solid #ddd;
+                border-radius: 4px;
+                font-size: 0.9em;
+            }
 
-            window.updatePagination = function() {
-                const start = (window.currentPage - 1) * window.itemsPerPage;
-                const end = start + window.itemsPerPage;
-                document.querySelectorAll('.accordion-item').forEach(item => {
-                    item.style.display = 'none';
-                });
-                window.filteredItems.slice(start, end).forEach(item => {
-                    if (item) item.style.display = '';
-                });
-                window.updatePaginationControls();
-            };
+            .email-form-group textarea {
+                min-height: 100px;
+                resize: vertical;
+            }
 
-            window.updatePaginationControls = function() {
-                const totalPages = Math.ceil(window.filteredItems.length / window.itemsPerPage);
-                const paginationContainer = document.getElementById('pagination');
-                const pageInfo = document.getElementById('pageInfo');
-                if (!paginationContainer || !pageInfo) return;
-                const start = (window.currentPage - 1) * window.itemsPerPage + 1;
-                const end = Math.min(window.currentPage * window.itemsPerPage, window.filteredItems.length);
-                pageInfo.textContent = `Showing ${start}-${end} of ${window.filteredItems.length} anomalies`;
-                let paginationHTML = '';
-                paginationHTML += `<button class="pagination-btn" onclick="changePage(${window.currentPage - 1})" ${window.currentPage === 1 ? 'disabled' : ''}>Previous</button>`;
-                for (let i = 1; i <= totalPages; i++) {
-                    if (i === 1 || i === totalPages || (i >= window.currentPage - 2 && i <= window.currentPage + 2)) {
-                        paginationHTML += `<button class="pagination-btn ${i === window.currentPage ? 'active' : ''}" onclick="changePage(${i})">${i}</button>`;
-                    } else if ((i === window.currentPage - 3 && window.currentPage > 4) || (i === window.currentPage + 3 && window.currentPage < totalPages - 3)) {
-                        paginationHTML += `<span class="pagination-ellipsis">...</span>`;
-                    }
-                }
-                paginationHTML += `<button class="pagination-btn" onclick="changePage(${window.currentPage + 1})" ${window.currentPage === totalPages ? 'disabled' : ''}>Next</button>`;
-                paginationContainer.innerHTML = paginationHTML;
-            };
+            .email-form-actions {
+                display: flex;
+                justify-content: flex-end;
+                gap: 10px;
+                margin-top: 10px;
+            }
 
-            window.changePage = function(newPage) {
-                const totalPages = Math.ceil(window.filteredItems.length / window.itemsPerPage);
-                if (newPage < 1 || newPage > totalPages) return;
-                window.currentPage = newPage;
-                window.updatePagination();
-            };
+            .email-btn {
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-size: 0.9em;
+                cursor: pointer;
+                transition: all 0.2s;
+            }
 
-            window.changeItemsPerPage = function(newValue) {
-                const value = parseInt(newValue);
-                if (isNaN(value) || value < 1) return;
-                window.itemsPerPage = value;
-                window.currentPage = 1;
-                window.updatePagination();
-            };
-        </script>
-    </head>
-    <body>
-        <h1>AWS Cost Anomalies Report</h1>
-        <div class="controls">
-            <div class="filter-group">
-                <label for="searchText">Search Anomalies</label>
-                <input type="text" id="searchText" class="filter-input" placeholder="Search by ID, date, or amount...">
-            </div>
-            <div class="filter-group">
-                <label for="dateRange">Date Range</label>
-                <input type="text" id="dateRange" class="filter-input" placeholder="Select date range...">
-            </div>
-            <div class="filter-group">
-                <label for="minCost">Min Cost ($)</label>
-                <input type="number" id="minCost" class="filter-input" placeholder="Min cost..." min="0" step="0.01">
-            </div>
-            <div class="filter-group">
-                <label for="maxCost">Max Cost ($)</label>
-                <input type="number" id="maxCost" class="filter-input" placeholder="Max cost..." min="0" step="0.01">
-            </div>
-            <div class="filter-group">
-                <label for="serviceFilter">Service</label>
-                <select id="serviceFilter" class="filter-input">
-                    <option value="">All Services</option>
-    """
+            .email-btn-primary {
+                background: #4682b4;
+                color: white;
+                border: none;
+            }
 
-    # Add service options
-    for service in services_list:
-        html += f"""
-                    <option value="{service}">{service}</option>
-        """
+            .email-btn-secondary {
+                background: white;
+                color: #666;
+                border: 1px solid #ddd;
+            }
+
+            .email-btn:hover {
+                opacity: 0.9;
+            }
+"""
 
-    html += """
+report_css_version = hashlib.md5(REPORT_CSS.encode(), usedforsecurity=False).hexdigest()[:8]
+
+REPORT_ACCOUNT_FILTER = """
                 </select>
+                </span>
             </div>
             <div class="filter-group">
                 <label for="linkedAccountFilter">Linked Account</label>
+                <span class="select-wrap">
                 <select id="linkedAccountFilter" class="filter-input">
                     <option value="">All Accounts</option>
     """
 
-    # Add linked account options
-    for account in linked_accounts_list:
-        html += f"""
-                    <option value="{account}">{account}</option>
-        """
-
-    html += """
+REPORT_CONTROLS_END = """
                 </select>
+                </span>
             </div>
             <div class="export-group">
                 <button class="export-btn" onclick="clearFilters()">
@@ -1702,52 +1718,11 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
         <div class="accordion" id="anomalyAccordion">
     """
 
-    chart_idx = 0
-    for idx, entry in enumerate(entries):
-        try:
-            start_dt = datetime.strptime(entry.StartDate.split('T')[0], '%Y-%m-%d')
-            end_dt = datetime.strptime(entry.EndDate.split('T')[0], '%Y-%m-%d')
-            start_readable = start_dt.strftime('%m/%d/%Y')
-            end_readable = end_dt.strftime('%m/%d/%Y')
-        except Exception as e:
-            start_readable = entry.StartDate.split('T')[0]
-            end_readable = entry.EndDate.split('T')[0]
-
-        html += generate_accordion_html(entry, idx, start_readable, end_readable)
-        
-        for rc_idx, rc in enumerate(entry.RootCauses):
-            chart_id = f"chart_{idx}_{rc_idx}"
-            chart_idx += 1
-            
-            # Prepare data for Chart.js
-            labels = [point.Date for point in rc.CostUsageGraph]
-            data = [float(point.Amount) for point in rc.CostUsageGraph]
-            
-            html += generate_root_cause_html(rc, idx, rc_idx, chart_id)
-            html += generate_cost_usage_rows(rc)
-            html += """
-                        </table>
-                    </div>
-                </div>
-            """
-            
-            # Add Chart.js initialization code
-            html += f"""
-            <script>
-            (function() {{
-                const labels = {labels};
-                const data = {data};
-                window.charts.initialize('{chart_id}', labels, data);
-            }})();
-            </script>
-            """
-        html += """
-                </div>
-            </div>
-        """
-
-    html += """
+REPORT_ACCORDION_END = """
         </div>
+    """
+
+REPORT_FOOTER = """
         <div class="pagination-container">
             <div class="pagination-controls">
                 <div class="items-per-page">
@@ -1769,15 +1744,206 @@ def generate_html_report(entries: List[AnomalyEntry], filename: str):
     </html>
     """
 
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(html)
+# Static report sections are encoded once rather than on every report
+REPORT_HEAD_BYTES = REPORT_HEAD.encode("utf-8")
+REPORT_HEADER_BYTES = REPORT_HEADER.encode("utf-8")
+REPORT_ACCOUNT_FILTER_BYTES = REPORT_ACCOUNT_FILTER.encode("utf-8")
+REPORT_CONTROLS_END_BYTES = REPORT_CONTROLS_END.encode("utf-8")
+REPORT_ACCORDION_END_BYTES = REPORT_ACCORDION_END.encode("utf-8")
+REPORT_FOOTER_BYTES = REPORT_FOOTER.encode("utf-8")
+
+def to_readable_date(date_str):
+    # Dates were validated as ISO when fetched, so YYYY-MM-DD can be sliced directly
+    return f"{date_str[5:7]}/{date_str[8:10]}/{date_str[:4]}"
+
+def to_epoch_ms(date_str):
+    return int(datetime.fromisoformat(date_str[:10]).replace(tzinfo=UTC).timestamp()) * 1000
+
+def build_index_record(entry, start_readable, end_readable):
+    # Everything the client filters on, in the order the anomaly templates are emitted
+    return {
+        "haystack": f"{entry.AnomalyId}\x01{start_readable} to {end_readable}\x01${entry.TotalCostImpact}".lower(),
+        "cost_impact": float(entry.TotalCostImpact),
+        "start_ms": to_epoch_ms(entry.StartDate),
+        "end_ms": to_epoch_ms(entry.EndDate),
+        # Filter keys match the option values of the service and account selects
+        "services": sorted({rc.Service for rc in entry.RootCauses if rc.Service}),
+        "accounts": sorted({
+            f"{rc.LinkedAccount} ({rc.LinkedAccountName})" for rc in entry.RootCauses if rc.LinkedAccount
+        })
+    }
+
+def generate_json_payload(value):
+    # Escape '<' so the payload cannot close its script element
+    return orjson.dumps(value).replace(b"<", b"\\u003c").decode()
 
-    print(f"Saved HTML report to {filename}")
+def generate_accordion_html(entry, idx, start_readable, end_readable):
+    return ACCORDION_TEMPLATE.format_map({
+        "idx": idx,
+        "anomaly_id": html.escape(str(entry.AnomalyId)),
+        "start_readable": start_readable,
+        "end_readable": end_readable,
+        "total_cost_impact": entry.TotalCostImpact,
+        "duration": entry.DurationInDays,
+        "average_daily_cost": entry.AverageDailyCost,
+        "currency": entry.Currency
+    })
 
-# Entry point
-import asyncio
+def generate_root_cause_html(rc, idx, rc_idx, chart_id):
+    # API values are escaped once here and reused at every render site
+    tags_html = generate_tags_html(tuple(rc.Tags.items()))
+    
+    return ROOT_CAUSE_TEMPLATE.format_map({
+        "idx": idx,
+        "rc_idx": rc_idx,
+        "service": html.escape(str(rc.Service)),
+        "region": html.escape(str(rc.Region)),
+        "usage_type": html.escape(str(rc.UsageType)),
+        "linked_account": html.escape(str(rc.LinkedAccount)),
+        "linked_account_name": html.escape(str(rc.LinkedAccountName)),
+        "cost_impact": f"${rc.CostImpact:.2f}",
+        "tags": tags_html,
+        "chart_id": chart_id
+    })
+
+# Renderers for the fragments emitted once per tag, data point and option
+render_tag = TAG_TEMPLATE.format_map
+render_cost_usage_row = COST_USAGE_ROW_TEMPLATE.format_map
+render_option = OPTION_TEMPLATE.format_map
+
+# Root causes commonly share tags and, via the cost usage cache, identical graphs,
+# so their rendered fragments are memoized on the underlying values
+@lru_cache(maxsize=4096)
+def generate_tags_html(tag_items):
+    return "".join(
+        render_tag({"key": html.escape(key), "value": html.escape(value)})
+        for key, value in tag_items
+    )
 
+def generate_cost_usage_rows(graph):
+    return render_cost_usage_rows(tuple((point.Date, point.Amount, point.Unit) for point in graph))
+
+@lru_cache(maxsize=4096)
+def render_cost_usage_rows(points):
+    return "".join(
+        render_cost_usage_row({"date": date, "amount": amount, "unit": unit})
+        for date, amount, unit in points
+    )
+
+def generate_options_html(values):
+    return "".join(render_option({"value": html.escape(value)}) for value in values)
+
+get_point_date = attrgetter("Date")
+get_point_amount = attrgetter("Amount")
+
+def chart_id_for(idx, rc_idx):
+    # Canvas ids and chart payload keys must match, so both come from here
+    return f"chart_{idx}_{rc_idx}"
+
+def build_chart_series(graph):
+    # Amounts are already floats from the fetch
+    return {
+        "labels": list(map(get_point_date, graph)),
+        "data": list(map(get_point_amount, graph))
+    }
+
+def generate_html_report(entries: List[AnomalyEntry], filename: str):
+    # The stylesheet sits next to the report so the browser can cache it across reports
+    css_path = os.path.join(os.path.dirname(filename), report_css_filename)
+    with open(css_path, "w", encoding="utf-8") as f:
+        f.write(REPORT_CSS)
+
+    # The generator yields encoded chunks, written in binary mode to bypass the text layer
+    if gzip_html_report:
+        filename += ".gz"
+        with gzip.open(filename, "wb", compresslevel=6) as f:
+            f.writelines(iter_html_report(entries))
+    else:
+        with open(filename, "wb", buffering=1 << 20) as f:
+            f.writelines(iter_html_report(entries))
+
+    return filename
+
+def iter_html_report(entries: List[AnomalyEntry]):
+    # Collect unique services and linked accounts from anomalies in one pass
+    unique_services = set()
+    unique_linked_accounts = set()
+    for entry in entries:
+        for rc in entry.RootCauses:
+            if rc.Service:
+                unique_services.add(rc.Service)
+            if rc.LinkedAccount:
+                unique_linked_accounts.add(f"{rc.LinkedAccount} ({rc.LinkedAccountName})")
+    services_list = sorted(unique_services)
+    linked_accounts_list = sorted(unique_linked_accounts)
+
+    yield REPORT_HEAD_BYTES
+    yield REPORT_STYLESHEET_LINK.format_map({"href": f"{report_css_filename}?v={report_css_version}"}).encode("utf-8")
+    yield REPORT_HEADER_BYTES
+
+    yield generate_options_html(services_list).encode("utf-8")
+    yield REPORT_ACCOUNT_FILTER_BYTES
+    yield generate_options_html(linked_accounts_list).encode("utf-8")
+
+    yield REPORT_CONTROLS_END_BYTES
+
+    index_records = []
+    chart_payload = {}
+    for idx, entry in enumerate(entries):
+        start_readable = to_readable_date(entry.StartDate)
+        end_readable = to_readable_date(entry.EndDate)
+
+        index_records.append(build_index_record(entry, start_readable, end_readable))
+        # Each anomaly is assembled from its fragments and handed to the writer as one chunk
+        parts = [generate_accordion_html(entry, idx, start_readable, end_readable)]
+        
+        append = parts.append
+        
+        for rc_idx, rc in enumerate(entry.RootCauses):
+            chart_id = chart_id_for(idx, rc_idx)
+            graph = rc.CostUsageGraph
+            chart_payload[chart_id] = build_chart_series(graph)
+            
+            append(generate_root_cause_html(rc, idx, rc_idx, chart_id))
+            append(generate_cost_usage_rows(graph))
+            append(ROOT_CAUSE_FOOTER)
+        append(ACCORDION_FOOTER)
+        yield "".join(parts).encode("utf-8")
+
+    # Payloads sit outside #anomalyAccordion, whose children are replaced on every page render
+    yield REPORT_ACCORDION_END_BYTES
+    yield ANOMALY_INDEX_TEMPLATE.format_map({"payload": generate_json_payload(index_records)}).encode("utf-8")
+    yield CHART_DATA_TEMPLATE.format_map({"payload": generate_json_payload(chart_payload)}).encode("utf-8")
+    yield REPORT_FOOTER_BYTES
+
+async def main():
+    raw_anomalies = await fetch_anomalies_raw()
+    json_filename = "aws_anomalies_detailed.json"
+    writers = [asyncio.to_thread(save_to_json, raw_anomalies, json_filename)]
+    # Entity objects are only needed to render the HTML report
+    if write_html_report:
+        anomalies = materialize_entries(raw_anomalies)
+        writers.append(asyncio.to_thread(generate_html_report, anomalies, "aws_anomalies_detailed.html"))
+    # Both reports only read the entries; rendering is GIL-bound, so only their disk writes overlap
+    saved = await asyncio.gather(*writers)
+
+    # Reported once both writers finish, so the messages do not interleave
+    print(f"Saved {len(raw_anomalies)} entries to {json_filename}")
+    if write_html_report:
+        print(f"Saved HTML report to {saved[1]}")
+
+def configure_logging():
+    # Log records are queued and written by a listener thread, off the event loop
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.WARNING, handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
+# Entry point
 if __name__ == "__main__":
-    anomalies = asyncio.run(fetch_anomalies())
-    save_to_json(anomalies, "aws_anomalies_detailed.json")
-    generate_html_report(anomalies, "aws_anomalies_detailed.html")
+    log_listener = configure_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        log_listener.stop()